@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Memory and attribute-access benchmark: per-record dicts vs PublicationRecord.
+
+Builds the same synthetic batch once as plain dictionaries and once as
+slotted PublicationRecord objects and reports the traced allocation per
+record, both freshly built and after the normalized lookup keys (DOI, arXiv
+ID, title) have been cached, and the time to read the cached keys of every
+record. For reference it also times recomputing the keys on every read,
+which is what the dictionary-based pipeline used to do.
+
+    python _scripts/bench_publication_records.py --count 200000
+"""
+import argparse
+import time
+import tracemalloc
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from publication_keys import extract_arxiv_id, normalize_doi, normalize_title
+from publication_record import PublicationRecord
+
+VENUES = ("Phys. Rev. B", "J. Chem. Phys.", "arXiv", "Bull. Am. Phys. Soc.", "Mach. Learn. Sci. Technol.")
+KINDS = ("article", "preprint", "talk", "report")
+
+
+def synthetic_record(index: int) -> Dict[str, Any]:
+    """Return a realistic publication dictionary for the given index."""
+    year = 2000 + index % 26
+    doi = f"https://doi.org/10.1103/physrevb.{index}"
+    return {
+        "title": f"Synthetic study {index} of warm dense matter",
+        "author": "Ada Lovelace; Attila Cangi; Grace Hopper",
+        "year": year,
+        "date": f"{year}-01-{1 + index % 28:02d}",
+        # Venue and kind strings are rebuilt per record, as when parsed from JSON.
+        "journal": "".join(VENUES[index % len(VENUES)]),
+        "doi": doi,
+        "href": doi,
+        "pdf": None,
+        "path": doi,
+        "kind": "".join(KINDS[index % len(KINDS)]),
+    }
+
+
+def measure(build: Callable[[], List[Any]], warm: Callable[[List[Any]], int]) -> Dict[str, Any]:
+    """Return the batch and its traced memory before and after the keys are cached."""
+    tracemalloc.start()
+    batch = build()
+    built, _ = tracemalloc.get_traced_memory()
+    warm(batch)
+    warmed, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"batch": batch, "built": built, "warmed": warmed}
+
+
+def cache_dict_keys(batch: List[Dict[str, Any]]) -> int:
+    """Store the lookup keys in every dictionary record, as the merge would have to."""
+    hits = 0
+    for record in batch:
+        record["doi_norm"] = normalize_doi(record.get("doi")) or None
+        record["arxiv_id"] = extract_arxiv_id(record.get("doi"), record.get("href"), record.get("pdf"))
+        record["title_norm"] = normalize_title(record.get("title")) or None
+        if record["doi_norm"] and record["title_norm"]:
+            hits += 1
+    return hits
+
+
+def access_dicts(batch: List[Dict[str, Any]]) -> int:
+    """Read the cached lookup keys of every dictionary record."""
+    hits = 0
+    for record in batch:
+        if record["doi_norm"] and record["title_norm"]:
+            hits += 1
+    return hits
+
+
+def normalize_dicts(batch: List[Dict[str, Any]]) -> int:
+    """Recompute the lookup keys of every dictionary record on each read."""
+    hits = 0
+    for record in batch:
+        if normalize_doi(record.get("doi")) and normalize_title(record.get("title")):
+            hits += 1
+    return hits
+
+
+def cache_record_keys(batch: List[PublicationRecord]) -> int:
+    """Compute the lazily cached lookup keys of every PublicationRecord."""
+    hits = 0
+    for record in batch:
+        if record.doi_norm and record.title_norm and record.arxiv_id is None:
+            hits += 1
+    return hits
+
+
+def access_records(batch: List[PublicationRecord]) -> int:
+    """Read the cached lookup keys of every PublicationRecord."""
+    hits = 0
+    for record in batch:
+        if record.doi_norm and record.title_norm:
+            hits += 1
+    return hits
+
+
+def timed(function: Callable[[List[Any]], int], batch: List[Any], passes: int) -> float:
+    """Return the seconds needed for the given number of access passes."""
+    start = time.perf_counter()
+    for _ in range(passes):
+        function(batch)
+    return time.perf_counter() - start
+
+
+def run(count: int, passes: int = 3) -> None:
+    """Run the benchmark and print a short report."""
+    dicts = measure(lambda: [synthetic_record(index) for index in range(count)], cache_dict_keys)
+    records = measure(
+        lambda: [PublicationRecord.from_dict(synthetic_record(index)) for index in range(count)],
+        cache_record_keys,
+    )
+    dict_seconds = timed(access_dicts, dicts["batch"], passes)
+    record_seconds = timed(access_records, records["batch"], passes)
+    normalize_seconds = timed(normalize_dicts, dicts["batch"], passes)
+
+    print(f"{count} records, {passes} key-access passes")
+    print("                     B/record fresh  B/record keyed  cached key reads")
+    print(
+        f"  dict:              {dicts['built'] / count:14.1f}  {dicts['warmed'] / count:14.1f}"
+        f"  {dict_seconds:14.3f} s"
+    )
+    print(
+        f"  PublicationRecord: {records['built'] / count:14.1f}  {records['warmed'] / count:14.1f}"
+        f"  {record_seconds:14.3f} s"
+    )
+    print(
+        f"  memory saved: {1 - records['built'] / dicts['built']:.1%} both fresh, "
+        f"{1 - records['warmed'] / dicts['warmed']:.1%} both keyed, "
+        f"{1 - records['warmed'] / dicts['built']:.1%} keyed records vs fresh dicts"
+    )
+    print(f"  dict keys recomputed on every read: {normalize_seconds:.3f} s")
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--count", type=int, default=100_000, help="records per batch")
+    parser.add_argument("--passes", type=int, default=3, help="key-access passes")
+    args = parser.parse_args(argv)
+    run(args.count, args.passes)
+
+
+if __name__ == "__main__":
+    main()
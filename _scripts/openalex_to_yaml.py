@@ -5,21 +5,32 @@ and write them into _data/*.yml plus _bibliography/papers.bib
 for the Jekyll publications page.
 """
 import os
-import requests
 import yaml
 import sys
 import pathlib
 import json
-import html
-import unicodedata
-from typing import List, Dict, Any, Optional
-from pyiso4.ltwa import Abbreviate
+import functools
+from datetime import datetime
+from typing import List, Dict, Any, Iterable, Optional, Tuple
 import re
 import xml.etree.ElementTree as ET
 
+from publication_keys import (
+    format_bibtex_value,
+    normalize_doi,
+    normalize_title,
+    normalize_whitespace,
+)
+from publication_fragments import (
+    FragmentCache,
+    fragments_enabled,
+    load_render_context,
+    load_site_config,
+)
+from publication_record import PublicationRecord
+from publication_store import PublicationStore, STORE_FILE
+from venue_rules import VenueRules
 
-# Create an abbreviator instance globally
-abbreviator = Abbreviate.create()
 
 # --- PATHS ---
 ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
@@ -33,6 +44,7 @@ PREPRINTS_UNPUBLISHED_FILE = OUTPUT_DIR / "preprints-unpublished.yml"
 ARTICLES_JSON_FILE = OUTPUT_DIR / "articles.json"
 PREPRINTS_JSON_FILE = OUTPUT_DIR / "preprints.json"
 CITATIONS_FILE = OUTPUT_DIR / "citations.yml"
+OPENALEX_CITATIONS_FILE = OUTPUT_DIR / "openalex_citations.yml"
 
 # --- CONFIGURATION ---
 ORCID_ID = (os.getenv("ORCID_ID") or "0000-0001-9162-262X").strip()
@@ -40,6 +52,8 @@ ARXIV_AUTHOR_NAME = (os.getenv("ARXIV_AUTHOR_NAME") or "Attila Cangi").strip()
 TIMEOUT = 30
 OPENALEX_MAX_PAGES = int(os.getenv("OPENALEX_MAX_PAGES", "0"))
 OPENALEX_USER_AGENT = os.getenv("OPENALEX_USER_AGENT")
+OPENALEX_API_URL = (os.getenv("OPENALEX_API_URL") or "https://api.openalex.org").rstrip("/")
+ARXIV_API_URL = os.getenv("ARXIV_API_URL") or "http://export.arxiv.org/api/query"
 ORCID_REGEX = re.compile(r"^\d{4}-\d{4}-\d{4}-\d{3}[\dX]$")
 
 KIND_MAP = {
@@ -54,59 +68,33 @@ KIND_MAP = {
 }
 
 
-def normalize_whitespace(value: str) -> str:
-    """Collapse repeated whitespace and strip surrounding spaces."""
-    return re.sub(r"\s+", " ", value).strip()
+@functools.lru_cache(maxsize=None)
+def get_abbreviator():
+    """Return the shared ISO 4 abbreviator, loading the LTWA list on first use."""
+    from pyiso4.ltwa import Abbreviate
 
+    return Abbreviate.create()
 
-def strip_tags(value: str) -> str:
-    """Remove simple HTML/MathML tags from a string."""
-    return re.sub(r"<[^>]+>", "", value)
 
+@functools.lru_cache(maxsize=None)
+def get_venue_rules() -> VenueRules:
+    """Return the compiled venue rules (see _scripts/venue_rules.yml)."""
+    return VenueRules.from_file()
 
-def format_bibtex_value(value: Optional[str]) -> Optional[str]:
-    """Normalize and sanitize a BibTeX field value."""
-    if not value:
-        return None
-    cleaned = strip_tags(value)
-    cleaned = html.unescape(cleaned)
-    return normalize_whitespace(cleaned)
 
+def abbreviate_venue(name: str) -> str:
+    """Abbreviate a venue name with ISO 4 rules."""
+    return get_abbreviator()(name, remove_part=True)
 
-def normalize_title(title: Optional[str]) -> Optional[str]:
-    """Normalize title text for resilient publication/preprint comparisons."""
-    if not title:
-        return None
-    cleaned = format_bibtex_value(title)
-    if not cleaned:
-        return None
-    normalized = unicodedata.normalize("NFKD", cleaned)
-    normalized = normalized.replace("−", "-").replace("–", "-").replace("—", "-")
-    normalized = normalized.replace("’", "'").replace("‘", "'")
-    normalized = normalized.lower()
-    normalized = re.sub(r"[^a-z0-9]+", " ", normalized)
-    return normalize_whitespace(normalized)
 
-
-def normalize_doi(doi: Optional[str]) -> Optional[str]:
-    """Return a canonical DOI string without protocol prefixes."""
-    if not doi:
-        return None
-    normalized = doi.strip().lower()
-    for prefix in ("https://doi.org/", "http://doi.org/", "doi:"):
-        if normalized.startswith(prefix):
-            normalized = normalized[len(prefix) :]
-    return normalized
-
-
-def has_published_version_doi(record: Dict[str, Any]) -> bool:
+def has_published_version_doi(record: PublicationRecord) -> bool:
     """Return True when a preprint advertises an apparent published-version DOI."""
-    doi_norm = normalize_doi(record.get("doi"))
+    doi_norm = record.doi_norm
     if not doi_norm:
         return False
 
-    journal = (record.get("journal") or "").lower()
-    href = (record.get("href") or "").lower()
+    journal = (record.journal or "").lower()
+    href = (record.href or "").lower()
     is_arxiv_record = "arxiv" in journal or "arxiv.org" in href
     is_arxiv_doi = doi_norm.startswith("10.48550/arxiv")
     has_named_journal = bool(journal) and "arxiv" not in journal
@@ -137,40 +125,99 @@ def load_scholar_citation_index() -> Dict[str, List[Dict[str, Optional[str]]]]:
 
 
 def attach_google_scholar_ids(
-    records: List[Dict[str, Any]],
+    store: PublicationStore,
     citation_index: Dict[str, List[Dict[str, Optional[str]]]],
 ) -> int:
     """Attach google_scholar_id fields by matching titles (and years when possible)."""
     if not citation_index:
         return 0
     matched = 0
-    for record in records:
-        title_norm = normalize_title(record.get("title"))
-        if not title_norm:
-            continue
-        candidates = citation_index.get(title_norm)
-        if not candidates:
-            continue
-        year_value = record.get("year") or (record.get("date") or "")[:4]
-        year_str = str(year_value) if year_value else None
-        pub_id = None
-        if year_str:
-            for candidate in candidates:
-                if candidate.get("year") == year_str:
-                    pub_id = candidate.get("id")
-                    break
-        if not pub_id and len(candidates) == 1:
-            pub_id = candidates[0].get("id")
-        if pub_id:
-            record["google_scholar_id"] = pub_id
-            matched += 1
+    for title_norm, candidates in citation_index.items():
+        for row in store.find_by_title(title_norm):
+            year_value = row["year"] or (row["date"] or "")[:4]
+            year_str = str(year_value) if year_value else None
+            pub_id = None
+            if year_str:
+                for candidate in candidates:
+                    if candidate.get("year") == year_str:
+                        pub_id = candidate.get("id")
+                        break
+            if not pub_id and len(candidates) == 1:
+                pub_id = candidates[0].get("id")
+            if pub_id:
+                store.set_google_scholar_id(row["id"], pub_id)
+                matched += 1
+    store.commit()
     return matched
 
 
-def fetch_publications(orcid: str) -> List[Dict[str, Any]]:
-    """Fetch all public works for a given ORCID from the OpenAlex API."""
+# Fields of an OpenAlex work read by collect_openalex_citations.
+OPENALEX_CITATION_FIELDS = "id,doi,title,publication_year,cited_by_count,counts_by_year"
+
+
+def collect_openalex_citations(works: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Collect OpenAlex citation counts, keyed by normalized DOI or OpenAlex work ID."""
+    citations: Dict[str, Dict[str, Any]] = {}
+    for work in works:
+        key = normalize_doi(work.get("doi")) or work.get("id")
+        if not key:
+            continue
+        counts_by_year = {
+            entry["year"]: entry.get("cited_by_count", 0)
+            for entry in work.get("counts_by_year") or []
+            if entry.get("year")
+        }
+        citations[key] = {
+            "id": work.get("id"),
+            "title": work.get("title"),
+            "year": work.get("publication_year"),
+            "citations": work.get("cited_by_count") or 0,
+            "counts_by_year": counts_by_year,
+        }
+    return citations
+
+
+def write_openalex_citations_file(citations: Dict[str, Dict[str, Any]]) -> None:
+    """Write OpenAlex citation counts unless they are unchanged since the last run."""
+    if OPENALEX_CITATIONS_FILE.exists():
+        try:
+            with OPENALEX_CITATIONS_FILE.open("r", encoding="utf-8") as file:
+                existing_data = yaml.safe_load(file) or {}
+            if existing_data.get("papers") == citations:
+                print("No changes in OpenAlex citation data. Skipping file update.")
+                return
+        except yaml.YAMLError as exc:
+            print(f"Warning: Could not parse {OPENALEX_CITATIONS_FILE}: {exc}", file=sys.stderr)
+
+    citation_data = {
+        "metadata": {"last_updated": datetime.now().strftime("%Y-%m-%d")},
+        "papers": citations,
+    }
+    OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
+    with OPENALEX_CITATIONS_FILE.open("w", encoding="utf-8") as file:
+        yaml.dump(citation_data, file, allow_unicode=True, width=1000, sort_keys=True)
+    print(f"Wrote OpenAlex citation counts for {len(citations)} works to {OPENALEX_CITATIONS_FILE}")
+
+
+def fetch_publications(
+    orcid: str,
+    session: Optional[Any] = None,
+    filters: str = "",
+    select: Optional[str] = None,
+) -> List[Dict[str, Any]]:
+    """Fetch all public works for a given ORCID from the OpenAlex API.
+
+    Pass a ``requests.Session`` to reuse its connections across calls,
+    extra comma-separated ``filters`` to narrow the works, and ``select`` to
+    return only some fields of each work.
+    """
+    import requests
+
+    http = session or requests
     records, seen = [], set()
-    base_url = f"https://api.openalex.org/works?filter=author.orcid:{orcid}&per-page=200"
+    base_url = f"{OPENALEX_API_URL}/works?filter=author.orcid:{orcid}{filters}&per-page=200"
+    if select:
+        base_url += f"&select={select}"
     url = base_url + "&cursor=*"
     print("Fetching publications from OpenAlex...")
 
@@ -184,7 +231,7 @@ def fetch_publications(orcid: str) -> List[Dict[str, Any]]:
             break
 
         try:
-            response = requests.get(url, timeout=TIMEOUT, headers=headers)
+            response = http.get(url, timeout=TIMEOUT, headers=headers)
             response.raise_for_status()
             page = response.json()
 
@@ -210,15 +257,22 @@ def fetch_publications(orcid: str) -> List[Dict[str, Any]]:
     return records
 
 
-def fetch_from_arxiv(author_name: str) -> List[Dict[str, Any]]:
-    """Fetch preprints for a given author from the arXiv API."""
+def fetch_from_arxiv(author_name: str, session: Optional[Any] = None) -> List[PublicationRecord]:
+    """Fetch preprints for a given author from the arXiv API.
+
+    Pass a ``requests.Session`` to reuse its connections across calls.
+    """
+    import requests
+
+    http = session or requests
+
     if not author_name:
         return []
     author_query = author_name.strip().replace('"', "")
     if not author_query:
         return []
 
-    base_url = "http://export.arxiv.org/api/query"
+    base_url = ARXIV_API_URL
     params = {
         "search_query": f'au:"{author_query}"',
         "sortBy": "submittedDate",
@@ -229,7 +283,7 @@ def fetch_from_arxiv(author_name: str) -> List[Dict[str, Any]]:
 
     print(f"Fetching publications from arXiv for author '{author_name}'...")
     try:
-        response = requests.get(base_url, params=params, timeout=TIMEOUT)
+        response = http.get(base_url, params=params, timeout=TIMEOUT)
         response.raise_for_status()
         root = ET.fromstring(response.content)
 
@@ -251,7 +305,7 @@ def fetch_from_arxiv(author_name: str) -> List[Dict[str, Any]]:
         return []
 
 
-def format_arxiv_entry(entry: ET.Element) -> Dict[str, Any]:
+def format_arxiv_entry(entry: ET.Element) -> PublicationRecord:
     """Format a single arXiv entry into a publication record."""
     ns = {"atom": "http://www.w3.org/2005/Atom", "arxiv": "http://arxiv.org/schemas/atom"}
 
@@ -292,52 +346,30 @@ def format_arxiv_entry(entry: ET.Element) -> Dict[str, Any]:
     year = int(published_text.split("-")[0]) if published_text else None
     date = published_text.split("T")[0] if published_text and "T" in published_text else published_text
 
-    return {
-        "title": title,
-        "author": "; ".join(authors),
-        "year": year,
-        "date": date,
-        "journal": "arXiv",
-        "doi": doi,
-        "href": href,
-        "pdf": pdf,
-        "path": doi if doi else href,
-        "kind": "preprint",
-    }
+    return PublicationRecord(
+        title=title,
+        author="; ".join(authors),
+        year=year,
+        date=date,
+        journal="arXiv",
+        doi=doi,
+        href=href,
+        pdf=pdf,
+        path=doi if doi else href,
+        kind="preprint",
+    )
 
 
-def classify_and_format_publication(work: Dict[str, Any]) -> Dict[str, Any]:
+def classify_and_format_publication(work: Dict[str, Any]) -> PublicationRecord:
     """Classify and format a single publication record."""
     authors = "; ".join(a["author"]["display_name"] for a in work.get("authorships", []))
     kind = KIND_MAP.get(work.get("type"), work.get("type", "other"))
 
     primary_location = work.get("primary_location") or {}
     source = primary_location.get("source") or {}
-    journal = source.get("display_name")
-    if journal:
-        journal = abbreviator(journal, remove_part=True)
-
-    # Normalize specific journal abbreviations
-    if journal and re.match(r"Phys\. rev\., B\.?/?Physical rev\., B", journal):
-        journal = "Phys. Rev. B"
-    elif journal and re.match(r"Phys\. rev\., A/?Physical rev\., A", journal):
-        journal = "Phys. Rev. A"
-
-    # Reclassify based on journal for specific cases
-    if journal and journal.lower().startswith("arxiv"):
-        kind = "preprint"
-    elif kind == "article" and (
-        journal in [
-            None,
-            "APS",
-            "Bull. Am. Phys. Soc.",
-            "APS March Meeting Abstracts",
-            "APS Div. Plasma Phys. Meet. Abstr.",
-            "APS March Meet. Abstr.",
-        ]
-        or (journal and (journal.startswith("APS Division") or journal.startswith("OSTI") or journal.startswith("PhDT")))
-    ):
-        kind = "talk"
+    venue_rules = get_venue_rules()
+    journal = venue_rules.normalize_venue(source.get("display_name"), abbreviate_venue)
+    kind = venue_rules.reclassify(kind, journal)
 
     doi = work.get("doi")
     if doi and doi.startswith("https://doi.org/"):
@@ -355,137 +387,124 @@ def classify_and_format_publication(work: Dict[str, Any]) -> Dict[str, Any]:
         open_access = work.get("open_access") or {}
         pdf_url = open_access.get("oa_url")
 
-    return {
-        "title": work.get("title"),
-        "author": authors,
-        "year": work.get("publication_year"),
-        "date": work.get("publication_date"),
-        "journal": journal,
-        "doi": doi,
-        "href": href,
-        "pdf": pdf_url,
-        "path": doi,
-        "kind": kind,
-    }
+    return PublicationRecord(
+        title=work.get("title"),
+        author=authors,
+        year=work.get("publication_year"),
+        date=work.get("publication_date"),
+        journal=journal,
+        doi=doi,
+        href=href,
+        pdf=pdf_url,
+        path=doi,
+        kind=kind,
+    )
 
 
-def mark_publication_page_records(records: List[Dict[str, Any]]) -> None:
-    """Mark records that should appear on the main publications page."""
-    articles = [record for record in records if record["kind"] == "article"]
-    article_dois = {
-        normalize_doi(record.get("doi"))
-        for record in articles
-        if record.get("doi")
-    }
-    article_titles = {
-        normalize_title(record.get("title"))
-        for record in articles
-        if record.get("title")
-    }
-    seen_unpublished_keys = set()
-    seen_unpublished_dois = set()
-    seen_unpublished_titles = set()
+def merge_publications(
+    store: PublicationStore,
+    openalex_works: Iterable[Dict[str, Any]],
+    arxiv_records: Iterable[PublicationRecord],
+) -> None:
+    """Rebuild the canonical publications from OpenAlex works plus unique arXiv preprints."""
+    store.reset_publications()
+    get_venue_rules().hits.clear()
+    for work in openalex_works:
+        store.insert_publication(
+            classify_and_format_publication(work), "openalex", work.get("id")
+        )
 
-    for record in records:
-        record.pop("publication_page", None)
-        record.pop("unpublished_preprint", None)
+    # Deduplicate arXiv publications against everything stored so far
+    unique_arxiv = 0
+    for record in arxiv_records:
+        _, inserted = store.upsert_publication(record, "arxiv", record.href)
+        if inserted:
+            unique_arxiv += 1
+    store.commit()
 
-        if record.get("kind") == "article":
-            record["publication_page"] = True
-            continue
+    if unique_arxiv:
+        print(f"Found {unique_arxiv} new unique publications from arXiv.")
+    print(f"Venue rule hits: {get_venue_rules().hit_summary()}")
 
-        if record.get("kind") != "preprint":
-            continue
 
-        doi_norm = normalize_doi(record.get("doi"))
-        title_norm = normalize_title(record.get("title"))
+def mark_publication_page_records(store: PublicationStore) -> None:
+    """Mark records that should appear on the main publications page."""
+    store.clear_publication_page_flags()
+    store.mark_kind_on_publication_page("article")
 
+    for publication_id in store.publication_ids(kind="preprint"):
+        record = store.get(publication_id)
         if has_published_version_doi(record):
             continue
 
-        if doi_norm:
-            key = f"doi:{doi_norm}"
-        elif title_norm:
-            key = f"title:{title_norm}"
-        else:
-            key = record.get("href")
-
-        if doi_norm and doi_norm in article_dois:
-            continue
-        if title_norm and title_norm in article_titles:
-            continue
-        if doi_norm and doi_norm in seen_unpublished_dois:
+        if store.has_kind_match("article", record.doi_norm, record.title_norm):
             continue
-        if title_norm and title_norm in seen_unpublished_titles:
+        if store.has_unpublished_match(record.doi_norm, record.title_norm, record.href):
             continue
-        if key and key in seen_unpublished_keys:
-            continue
-
-        seen_unpublished_keys.add(key)
-        if doi_norm:
-            seen_unpublished_dois.add(doi_norm)
-        if title_norm:
-            seen_unpublished_titles.add(title_norm)
-        record["unpublished_preprint"] = True
-        record["publication_page"] = True
 
+        store.mark_unpublished_preprint(publication_id)
+    store.commit()
 
-def write_yaml_files(records: List[Dict[str, Any]]) -> None:
-    """Sort records and write them to categorized YAML files."""
-    records.sort(
-        key=lambda record: (record.get("year") or 0, record.get("date") or ""),
-        reverse=True,
-    )
-
-    articles = [record for record in records if record["kind"] == "article"]
-    preprints = [record for record in records if record["kind"] == "preprint"]
-    others = [record for record in records if record["kind"] not in ["article", "preprint"]]
-    preprints_unpublished = [
-        record for record in preprints if record.get("unpublished_preprint")
-    ]
 
+def write_yaml_files(store: PublicationStore) -> None:
+    """Write the stored records, newest first, to categorized YAML files."""
     OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 
     header = "# This file is automatically generated. Do not edit manually."
 
     outputs = [
-        (ARTICLES_FILE, articles, "peer-reviewed articles"),
-        (PREPRINTS_FILE, preprints, "preprints"),
-        (OTHERS_FILE, others, "other publications"),
-        (PREPRINTS_UNPUBLISHED_FILE, preprints_unpublished, "unpublished preprints"),
+        (ARTICLES_FILE, store.iter_records(kinds=["article"]), "peer-reviewed articles"),
+        (PREPRINTS_FILE, store.iter_records(kinds=["preprint"]), "preprints"),
+        (
+            OTHERS_FILE,
+            store.iter_records(exclude_kinds=["article", "preprint"]),
+            "other publications",
+        ),
+        (
+            PREPRINTS_UNPUBLISHED_FILE,
+            store.iter_records(kinds=["preprint"], unpublished_only=True),
+            "unpublished preprints",
+        ),
     ]
 
-    for path, data, name in outputs:
+    for path, records, name in outputs:
+        count = 0
         with path.open("w", encoding="utf-8") as file:
             file.write(header)
             file.write("\n")
-            yaml.dump(data, file, allow_unicode=True, sort_keys=False, indent=2)
-        print(f"Wrote {len(data)} {name} to {path}")
+            # Dumping one single-item list per record yields the same block
+            # sequence as dumping the whole list, without materializing it.
+            for record in records:
+                yaml.dump([record.to_dict()], file, allow_unicode=True, sort_keys=False, indent=2)
+                count += 1
+            if not count:
+                yaml.dump([], file, allow_unicode=True, sort_keys=False, indent=2)
+        print(f"Wrote {count} {name} to {path}")
 
 
-def write_json_files(articles: List[Dict[str, Any]], preprints: List[Dict[str, Any]]) -> None:
+def write_json_files(store: PublicationStore) -> None:
     """Write JSON files for journal articles and preprints."""
     OUTPUT_DIR.mkdir(exist_ok=True, parents=True)
 
-    def serialize(records: List[Dict[str, Any]], kind: str) -> List[Dict[str, Any]]:
+    def serialize(records: Iterable[PublicationRecord], kind: str) -> List[Dict[str, Any]]:
         payload = []
         for record in records:
             payload.append(
                 {
-                    "title": record.get("title") or "",
-                    "year": record.get("year"),
-                    "authors": (record.get("author") or "").replace("; ", ", "),
-                    "venue": record.get("journal") or "",
-                    "doi": normalize_doi(record.get("doi")) or "",
-                    "url": record.get("href") or "",
+                    "title": record.title or "",
+                    "year": record.year,
+                    "authors": (record.author or "").replace("; ", ", "),
+                    "venue": record.journal or "",
+                    "doi": record.doi_norm or "",
+                    "url": record.href or "",
                     "type": kind,
-                    "pdf": record.get("pdf") or "",
+                    "pdf": record.pdf or "",
                 }
             )
         return payload
 
-    articles_payload = serialize(articles, "journal")
-    preprints_payload = serialize(preprints, "preprint")
+    articles_payload = serialize(store.iter_records(kinds=["article"]), "journal")
+    preprints_payload = serialize(store.iter_records(kinds=["preprint"]), "preprint")
 
     with ARTICLES_JSON_FILE.open("w", encoding="utf-8") as file:
         json.dump(articles_payload, file, ensure_ascii=True, indent=2)
@@ -508,13 +527,13 @@ def bibtex_type_for_kind(kind: str) -> str:
     }.get(kind, "misc")
 
 
-def make_bibtex_key(record: Dict[str, Any], used_keys: Dict[str, int]) -> str:
+def make_bibtex_key(record: PublicationRecord, used_keys: Dict[str, int]) -> str:
     """Create a stable BibTeX key from author, year, and title."""
-    authors = record.get("author") or ""
+    authors = record.author or ""
     first_author = authors.split(";")[0].strip() if authors else "unknown"
     last_name = first_author.split()[-1] if first_author else "unknown"
-    year = record.get("year") or (record.get("date") or "")[:4] or "n.d."
-    title = record.get("title") or ""
+    year = record.year or (record.date or "")[:4] or "n.d."
+    title = record.title or ""
     title = format_bibtex_value(title) or "untitled"
     title_word = re.sub(r"[^A-Za-z0-9]", "", title.split()[0]) if title else "untitled"
     base = f"{last_name}{year}{title_word}"
@@ -527,66 +546,90 @@ def make_bibtex_key(record: Dict[str, Any], used_keys: Dict[str, int]) -> str:
     return key
 
 
-def write_bibtex_file(records: List[Dict[str, Any]]) -> None:
-    """Write all records to a BibTeX file for Jekyll Scholar."""
+def bibtex_entry_fields(
+    record: PublicationRecord, used_keys: Dict[str, int]
+) -> Tuple[str, str, Dict[str, Optional[str]]]:
+    """Return the BibTeX entry type, key and fields for a record."""
+    entry_type = bibtex_type_for_kind(record.kind)
+    key = make_bibtex_key(record, used_keys)
+    authors = format_bibtex_value(record.author or "")
+    if authors:
+        authors = authors.replace("; ", " and ")
+
+    title = format_bibtex_value(record.title)
+    year = record.year or (record.date or "")[:4]
+    journal = format_bibtex_value(record.journal)
+    doi = record.doi_norm
+    url = record.href or record.pdf
+    google_scholar_id_value = record.google_scholar_id
+    google_scholar_id = str(google_scholar_id_value) if google_scholar_id_value else None
+    badge_enabled = "true" if doi else None
+    publication_page = "true" if record.publication_page else None
+    unpublished_preprint = "true" if record.unpublished_preprint else None
+
+    fields: Dict[str, Optional[str]] = {
+        "title": title,
+        "author": authors,
+        "year": str(year) if year else None,
+        "journal": journal if entry_type == "article" else journal,
+        "doi": doi,
+        "url": url,
+        "altmetric": badge_enabled,
+        "dimensions": badge_enabled,
+        "google_scholar_id": google_scholar_id,
+        "publication_page": publication_page,
+        "unpublished_preprint": unpublished_preprint,
+    }
+    return entry_type, key, fields
+
+
+def format_bibtex_entry(entry_type: str, key: str, fields: Dict[str, Optional[str]]) -> str:
+    """Render a single BibTeX entry."""
+    lines = [f"@{entry_type}{{{key},"]
+    for field, value in fields.items():
+        if value:
+            lines.append(f"  {field} = {{{value}}},")
+    lines.append("}")
+    return "\n".join(lines)
+
+
+def write_bibtex_file(store: PublicationStore) -> None:
+    """Write all stored records, newest first, to a BibTeX file for Jekyll Scholar.
+
+    Publication page entries are also pre-rendered into the fragment cache
+    when ``publication_fragments`` is enabled in _config.yml.
+    """
     BIBLIOGRAPHY_DIR.mkdir(exist_ok=True, parents=True)
     used_keys: Dict[str, int] = {}
-    entries: List[str] = []
-
-    for record in records:
-        entry_type = bibtex_type_for_kind(record.get("kind", "misc"))
-        key = make_bibtex_key(record, used_keys)
-        authors = format_bibtex_value(record.get("author") or "")
-        if authors:
-            authors = authors.replace("; ", " and ")
-
-        title = format_bibtex_value(record.get("title"))
-        year = record.get("year") or (record.get("date") or "")[:4]
-        journal = format_bibtex_value(record.get("journal"))
-        doi = normalize_doi(record.get("doi"))
-        url = record.get("href") or record.get("pdf")
-        google_scholar_id_value = record.get("google_scholar_id")
-        google_scholar_id = str(google_scholar_id_value) if google_scholar_id_value else None
-        badge_enabled = "true" if doi else None
-        publication_page = "true" if record.get("publication_page") else None
-        unpublished_preprint = "true" if record.get("unpublished_preprint") else None
-
-        fields: Dict[str, Optional[str]] = {
-            "title": title,
-            "author": authors,
-            "year": str(year) if year else None,
-            "journal": journal if entry_type == "article" else journal,
-            "doi": doi,
-            "url": url,
-            "altmetric": badge_enabled,
-            "dimensions": badge_enabled,
-            "google_scholar_id": google_scholar_id,
-            "publication_page": publication_page,
-            "unpublished_preprint": unpublished_preprint,
-        }
-
-        lines = [f"@{entry_type}{{{key},"]
-        for field, value in fields.items():
-            if value:
-                lines.append(f"  {field} = {{{value}}},")
-        lines.append("}")
-        entries.append("\n".join(lines))
+    count = 0
+    site_config = load_site_config()
+    fragments = (
+        FragmentCache(context=load_render_context(site_config))
+        if fragments_enabled(site_config)
+        else None
+    )
 
     header = "% This file is automatically generated. Do not edit manually."
     with BIBLIOGRAPHY_FILE.open("w", encoding="utf-8") as file:
         file.write(header)
-        file.write("\n\n")
-        file.write("\n\n".join(entries))
         file.write("\n")
-    print(f"Wrote {len(entries)} BibTeX entries to {BIBLIOGRAPHY_FILE}")
-
-
-def main() -> None:
-    """Fetch, classify, and write publications."""
-    if os.getenv("SKIP_OPENALEX", "").lower() in {"1", "true", "yes"}:
-        print("SKIP_OPENALEX is set; skipping OpenAlex/arXiv fetch.")
-        return
-
+        for record in store.iter_records():
+            entry_type, key, fields = bibtex_entry_fields(record, used_keys)
+            file.write("\n")
+            file.write(format_bibtex_entry(entry_type, key, fields))
+            file.write("\n")
+            count += 1
+            if fragments is not None and record.publication_page:
+                fragments.add(key, fields)
+        if not count:
+            file.write("\n\n")
+    print(f"Wrote {count} BibTeX entries to {BIBLIOGRAPHY_FILE}")
+    if fragments is not None:
+        fragments.finish()
+
+
+def validate_orcid() -> None:
+    """Exit with an error unless ORCID_ID is a well-formed ORCID."""
     if not ORCID_ID or not ORCID_REGEX.match(ORCID_ID):
         print(
             f"Invalid ORCID_ID '{ORCID_ID}'. Set a valid ORCID_ID env var.",
@@ -594,63 +637,59 @@ def main() -> None:
         )
         sys.exit(1)
 
-    print(f"Using ORCID_ID={ORCID_ID}")
 
-    # Fetch from OpenAlex
+def fetch_sources(store: PublicationStore) -> None:
+    """Fetch OpenAlex works and arXiv preprints into the store's source records."""
+    print(f"Using ORCID_ID={ORCID_ID}")
     openalex_publications = fetch_publications(ORCID_ID)
-    formatted_publications = [
-        classify_and_format_publication(publication)
-        for publication in openalex_publications
-    ]
-
-    # Fetch from arXiv and combine
     arxiv_publications = fetch_from_arxiv(ARXIV_AUTHOR_NAME)
 
-    # Deduplicate arXiv publications against OpenAlex publications
-    openalex_dois = {
-        normalize_doi(publication.get("doi"))
-        for publication in formatted_publications
-        if publication.get("doi")
-    }
-    openalex_titles = {
-        normalize_title(publication.get("title"))
-        for publication in formatted_publications
-        if publication.get("title")
-    }
-
-    unique_arxiv_pubs = []
-    for publication in arxiv_publications:
-        is_duplicate = False
-        doi_norm = normalize_doi(publication.get("doi"))
-        title_norm = normalize_title(publication.get("title"))
-
-        if doi_norm and doi_norm in openalex_dois:
-            is_duplicate = True
-        elif title_norm and title_norm in openalex_titles:
-            is_duplicate = True
+    store.replace_source_records(
+        "openalex", ((work["id"], work) for work in openalex_publications)
+    )
+    store.replace_source_records(
+        "arxiv", ((record.href, record.to_dict()) for record in arxiv_publications)
+    )
 
-        if not is_duplicate:
-            unique_arxiv_pubs.append(publication)
-            if doi_norm:
-                openalex_dois.add(doi_norm)
-            if title_norm:
-                openalex_titles.add(title_norm)
 
-    if unique_arxiv_pubs:
-        print(f"Found {len(unique_arxiv_pubs)} new unique publications from arXiv.")
-        formatted_publications.extend(unique_arxiv_pubs)
+def merge_stored_sources(store: PublicationStore) -> None:
+    """Rebuild, deduplicate and mark the canonical publications from stored source records."""
+    merge_publications(
+        store,
+        store.iter_source_records("openalex"),
+        (PublicationRecord.from_dict(data) for data in store.iter_source_records("arxiv")),
+    )
 
     citation_index = load_scholar_citation_index()
     if citation_index:
-        matched = attach_google_scholar_ids(formatted_publications, citation_index)
+        matched = attach_google_scholar_ids(store, citation_index)
         print(f"Matched {matched} publications to Google Scholar IDs.")
 
-    mark_publication_page_records(formatted_publications)
-    write_yaml_files(formatted_publications)
-    write_bibtex_file(formatted_publications)
-    articles = [record for record in formatted_publications if record.get("kind") == "article"]
-    preprints = [record for record in formatted_publications if record.get("kind") == "preprint"]
-    write_json_files(articles, preprints)
+    mark_publication_page_records(store)
+    store.mark_merged()
+
+
+def write_outputs(store: PublicationStore) -> None:
+    """Write the YAML, BibTeX, JSON and OpenAlex citation outputs from the store."""
+    write_yaml_files(store)
+    write_bibtex_file(store)
+    write_json_files(store)
+    write_openalex_citations_file(
+        collect_openalex_citations(store.iter_source_records("openalex"))
+    )
+
+
+def main() -> None:
+    """Fetch, classify, and write publications."""
+    if os.getenv("SKIP_OPENALEX", "").lower() in {"1", "true", "yes"}:
+        print("SKIP_OPENALEX is set; skipping OpenAlex/arXiv fetch.")
+        return
+
+    validate_orcid()
+    with PublicationStore(STORE_FILE) as store:
+        fetch_sources(store)
+        merge_stored_sources(store)
+        write_outputs(store)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,271 @@
+"""
+Long-running publication sync daemon.
+
+Keeps one HTTP session, the ISO 4 abbreviator, the compiled venue rules and
+the publication store open between cycles. Each source (OpenAlex, arXiv and,
+optionally, Google Scholar) is polled on its own adaptive interval: the
+interval halves when the source has changed and grows when it has not,
+within the configured bounds. Outputs are regenerated only after a change.
+
+Only what ends up in the outputs counts as a change: OpenAlex works are
+compared by their classified publication record and citation counts, so
+volatile fields such as ``updated_date`` do not trigger a rebuild. After
+the first full download, OpenAlex polls fetch just the ID, update date and
+citation count of each work and download only new or updated works.
+
+Point OPENALEX_API_URL and ARXIV_API_URL at local stand-in servers and
+limit the number of cycles to exercise the daemon without the real APIs:
+
+    OPENALEX_API_URL=http://localhost:8000 ARXIV_API_URL=http://localhost:8000/arxiv \\
+        python _scripts/publications.py daemon --cycles 3 --min-interval 1
+"""
+import hashlib
+import json
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+import openalex_to_yaml
+from publication_store import PublicationStore
+
+DEFAULT_MIN_INTERVAL = 5 * 60
+DEFAULT_MAX_INTERVAL = 6 * 60 * 60
+SCHOLAR_MIN_INTERVAL = 6 * 60 * 60
+SCHOLAR_MAX_INTERVAL = 48 * 60 * 60
+BACKOFF_FACTOR = 1.5
+OPENALEX_PROBE_FIELDS = "id,updated_date,cited_by_count"
+# Works per ids.openalex filter; OpenAlex accepts up to 100 OR-ed values.
+OPENALEX_ID_BATCH = 50
+
+
+def fingerprint(payload: Any) -> str:
+    """Return a stable content hash of a JSON-serializable payload."""
+    encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def openalex_fingerprint(works: List[Dict[str, Any]]) -> str:
+    """Hash only the parts of OpenAlex works that the outputs are built from."""
+    records = [
+        openalex_to_yaml.classify_and_format_publication(work).to_dict() for work in works
+    ]
+    return fingerprint([records, openalex_to_yaml.collect_openalex_citations(works)])
+
+
+class SourcePoller:
+    """Poll one source on an interval that adapts to how often it changes."""
+
+    def __init__(
+        self,
+        name: str,
+        fetch: Callable[[], Optional[Any]],
+        apply: Callable[[Any], None],
+        min_interval: float,
+        max_interval: float,
+        last_fingerprint: Optional[str] = None,
+        digest: Callable[[Any], str] = fingerprint,
+    ) -> None:
+        self.name = name
+        self.fetch = fetch
+        self.apply = apply
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.interval = min_interval
+        self.next_due = 0.0
+        self.last_fingerprint = last_fingerprint
+        self.digest = digest
+
+    def poll(self, now: float) -> bool:
+        """Fetch the source, store it when it changed, and return whether it changed."""
+        payload = self.fetch()
+        if payload is None:
+            changed = False
+            self.interval = min(self.max_interval, self.interval * 2)
+            print(f"[{self.name}] fetch failed; retrying in {self.interval:.0f} s.")
+        else:
+            current = self.digest(payload)
+            changed = current != self.last_fingerprint
+            if changed:
+                self.apply(payload)
+                self.last_fingerprint = current
+                self.interval = max(self.min_interval, self.interval / 2)
+            else:
+                self.interval = min(self.max_interval, self.interval * BACKOFF_FACTOR)
+            state = "changed" if changed else "unchanged"
+            print(f"[{self.name}] {state}; next poll in {self.interval:.0f} s.")
+        self.next_due = now + self.interval
+        return changed
+
+
+class PublicationDaemon:
+    """Poll the publication sources and regenerate the outputs on change."""
+
+    def __init__(
+        self,
+        store: PublicationStore,
+        min_interval: float = DEFAULT_MIN_INTERVAL,
+        max_interval: float = DEFAULT_MAX_INTERVAL,
+        scholar: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        import requests
+
+        self.store = store
+        self.clock = clock
+        self.sleep = sleep
+        self.session = requests.Session()
+        if openalex_to_yaml.OPENALEX_USER_AGENT:
+            self.session.headers["User-Agent"] = openalex_to_yaml.OPENALEX_USER_AGENT
+        # Latest known OpenAlex works by ID, compared against the lightweight polls.
+        self.works: Dict[str, Dict[str, Any]] = {
+            work["id"]: work for work in store.iter_source_records("openalex")
+        }
+
+        self.pollers: List[SourcePoller] = [
+            SourcePoller(
+                "openalex",
+                self.fetch_openalex,
+                lambda works: store.replace_source_records(
+                    "openalex", ((work["id"], work) for work in works)
+                ),
+                min_interval,
+                max_interval,
+                self.stored_fingerprint("openalex", openalex_fingerprint),
+                openalex_fingerprint,
+            ),
+            SourcePoller(
+                "arxiv",
+                self.fetch_arxiv,
+                lambda records: store.replace_source_records(
+                    "arxiv", ((record["href"], record) for record in records)
+                ),
+                min_interval,
+                max_interval,
+                self.stored_fingerprint("arxiv"),
+            ),
+        ]
+        if scholar:
+            self.pollers.append(
+                SourcePoller(
+                    "scholar",
+                    self.fetch_scholar,
+                    lambda _: None,
+                    max(min_interval, SCHOLAR_MIN_INTERVAL),
+                    max(max_interval, SCHOLAR_MAX_INTERVAL),
+                    self.scholar_fingerprint(),
+                )
+            )
+
+    def stored_fingerprint(
+        self, source: str, digest: Callable[[Any], str] = fingerprint
+    ) -> Optional[str]:
+        """Fingerprint the stored records of a source, so restarts do not regenerate."""
+        records = list(self.store.iter_source_records(source))
+        return digest(records) if records else None
+
+    def has_stored_records(self, source: str) -> bool:
+        """Return True when the store already holds records of the source."""
+        return bool(self.store.source_counts().get(source))
+
+    def fetch_openalex(self) -> Optional[List[Any]]:
+        """Fetch OpenAlex works; None signals a failed fetch."""
+        try:
+            if self.works:
+                works = self.fetch_openalex_updates()
+            else:
+                works = openalex_to_yaml.fetch_publications(
+                    openalex_to_yaml.ORCID_ID, self.session
+                )
+        except SystemExit:
+            # fetch_publications exits on HTTP errors; keep the daemon alive.
+            return None
+        if works is None or (not works and self.has_stored_records("openalex")):
+            return None
+        self.works = {work["id"]: work for work in works}
+        return works
+
+    def fetch_openalex_updates(self) -> Optional[List[Any]]:
+        """List the works cheaply and download only the new or updated ones."""
+        orcid = openalex_to_yaml.ORCID_ID
+        listing = openalex_to_yaml.fetch_publications(
+            orcid, self.session, select=OPENALEX_PROBE_FIELDS
+        )
+        changed = []
+        for item in listing:
+            known = self.works.get(item["id"])
+            if known is None or any(
+                known.get(field) != item.get(field) for field in ("updated_date", "cited_by_count")
+            ):
+                changed.append(item["id"])
+
+        updated: Dict[str, Dict[str, Any]] = {}
+        for start in range(0, len(changed), OPENALEX_ID_BATCH):
+            batch = changed[start:start + OPENALEX_ID_BATCH]
+            ids = "|".join(work_id.rsplit("/", 1)[-1] for work_id in batch)
+            for work in openalex_to_yaml.fetch_publications(
+                orcid, self.session, filters=f",ids.openalex:{ids}"
+            ):
+                updated[work["id"]] = work
+        if any(work_id not in updated for work_id in changed):
+            return None
+        print(f"[openalex] {len(changed)} of {len(listing)} works new or updated.")
+        return [updated.get(item["id"]) or self.works[item["id"]] for item in listing]
+
+    def fetch_arxiv(self) -> Optional[List[Any]]:
+        """Fetch arXiv preprints; None signals a failed fetch."""
+        records = openalex_to_yaml.fetch_from_arxiv(
+            openalex_to_yaml.ARXIV_AUTHOR_NAME, self.session
+        )
+        # fetch_from_arxiv reports errors as an empty result.
+        if not records and self.has_stored_records("arxiv"):
+            return None
+        return [record.to_dict() for record in records]
+
+    def fetch_scholar(self) -> Optional[str]:
+        """Refresh the Google Scholar cache and return its contents."""
+        import update_scholar_citations
+
+        try:
+            update_scholar_citations.get_scholar_citations()
+        except SystemExit:
+            return None
+        return self.read_scholar_cache()
+
+    def read_scholar_cache(self) -> Optional[str]:
+        """Return the Google Scholar citations cache contents, if present."""
+        if not openalex_to_yaml.CITATIONS_FILE.exists():
+            return None
+        return openalex_to_yaml.CITATIONS_FILE.read_text(encoding="utf-8")
+
+    def scholar_fingerprint(self) -> Optional[str]:
+        """Fingerprint the current Google Scholar cache."""
+        contents = self.read_scholar_cache()
+        return fingerprint(contents) if contents is not None else None
+
+    def run_cycle(self) -> bool:
+        """Poll all due sources; regenerate outputs and return True on change."""
+        now = self.clock()
+        changed = False
+        for poller in self.pollers:
+            if poller.next_due <= now:
+                changed = poller.poll(now) or changed
+        if changed:
+            openalex_to_yaml.merge_stored_sources(self.store)
+            openalex_to_yaml.write_outputs(self.store)
+        return changed
+
+    def run(self, cycles: Optional[int] = None) -> None:
+        """Run until interrupted, or for the given number of cycles."""
+        completed = 0
+        try:
+            while cycles is None or completed < cycles:
+                self.run_cycle()
+                completed += 1
+                if cycles is not None and completed >= cycles:
+                    break
+                next_due = min(poller.next_due for poller in self.pollers)
+                self.sleep(max(0.0, next_due - self.clock()))
+        except KeyboardInterrupt:
+            print("Publication daemon stopped.")
+        finally:
+            self.session.close()
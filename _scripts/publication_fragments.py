@@ -0,0 +1,253 @@
+"""
+Pre-rendered HTML fragments for the publications page.
+
+Every BibTeX entry shown on the publications page is rendered once into
+_includes/publication_fragments/<hash>.html, where the hash covers the
+entry's fields plus the site settings that affect its markup. Entries whose
+hash is unchanged reuse the existing file, so a run only renders new or
+edited entries. _data/publication_fragments.yml lists the fragments in page
+order and is read by _includes/publication_fragments.liquid.
+
+Citation counts are not baked in: the badges look them up from
+_data/citations.yml and _data/openalex_citations.yml when the site builds,
+so daily count updates do not invalidate the fragments.
+"""
+import hashlib
+import html
+import json
+import pathlib
+import re
+from typing import Any, Dict, List, Optional
+
+import yaml
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+CONFIG_FILE = ROOT_DIR / "_config.yml"
+FRAGMENTS_DIR = ROOT_DIR / "_includes" / "publication_fragments"
+FRAGMENTS_INDEX_FILE = ROOT_DIR / "_data" / "publication_fragments.yml"
+
+# Bump when the fragment markup changes to re-render every entry.
+FRAGMENT_FORMAT_VERSION = 3
+
+# Author markers (equal contribution, corresponding author, ...) as in _layouts/bib.liquid.
+AUTHOR_MARKERS_REGEX = re.compile(r"([*∗†‡§¶‖&^]+)")
+
+
+def load_site_config(config_file: pathlib.Path = CONFIG_FILE) -> Dict[str, Any]:
+    """Read the Jekyll site configuration, or an empty one if it is missing."""
+    if not config_file.exists():
+        return {}
+    with config_file.open("r", encoding="utf-8") as file:
+        return yaml.safe_load(file) or {}
+
+
+def fragments_enabled(config: Optional[Dict[str, Any]] = None) -> bool:
+    """Return True when the site builds its publications page from the fragments."""
+    config = load_site_config() if config is None else config
+    return bool(config.get("publication_fragments"))
+
+
+def load_render_context(config: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Read the site settings that affect how a fragment is rendered."""
+    config = load_site_config() if config is None else config
+    scholar = config.get("scholar") or {}
+    return {
+        "last_names": list(scholar.get("last_name") or []),
+        "first_names": list(scholar.get("first_name") or []),
+        "max_author_limit": config.get("max_author_limit"),
+        "thumbnails": bool(config.get("enable_publication_thumbnails")),
+    }
+
+
+def text(value: Optional[str]) -> str:
+    """Escape text for HTML and keep Liquid from interpreting braces."""
+    escaped = html.escape(value or "")
+    return escaped.replace("{", "&#123;").replace("}", "&#125;")
+
+
+def liquid_string(value: Optional[str]) -> Optional[str]:
+    """Return a double-quoted Liquid string literal, or None if empty or unquotable."""
+    if not value or '"' in value or "{" in value or "}" in value or "%" in value:
+        return None
+    return f'"{value}"'
+
+
+def author_html(name: str) -> str:
+    """Escape an author name and render its markers as superscripts."""
+    return "".join(
+        f"<sup>{text(part)}</sup>" if AUTHOR_MARKERS_REGEX.fullmatch(part) else text(part)
+        for part in AUTHOR_MARKERS_REGEX.split(name)
+    )
+
+
+def js_string(value: str) -> str:
+    """Escape a value for a single-quoted JavaScript string inside an HTML attribute."""
+    return text(value.replace("\\", "\\\\").replace("'", "\\'"))
+
+
+def format_author(name: str, context: Dict[str, Any]) -> str:
+    """Render one author, emphasizing the site owner."""
+    first, _, last = name.rpartition(" ")
+    rendered = author_html(name)
+    last = AUTHOR_MARKERS_REGEX.sub("", last)
+    if last in context["last_names"] and first in context["first_names"]:
+        return f"<em>{rendered}</em>"
+    return rendered
+
+
+def format_more_authors(hidden: List[str]) -> str:
+    """Render the click-to-expand list of authors beyond max_author_limit."""
+    more = f"{len(hidden)} more author{'s' if len(hidden) > 1 else ''}"
+    show = ", ".join(author_html(name) for name in hidden)
+    onclick = (
+        "var element = $(this); element.attr('title', ''); "
+        f"var more_authors_text = element.text() == '{more}' ? '{js_string(show)}' : '{more}'; "
+        "var cursorPosition = 0; var textAdder = setInterval(function(){ "
+        "element.html(more_authors_text.substring(0, cursorPosition + 1)); "
+        "if (++cursorPosition == more_authors_text.length){ clearInterval(textAdder); } "
+        "}, '{{ site.more_authors_animation_delay }}');"
+    )
+    return f'<span class="more-authors" title="click to view {more}" onclick="{onclick}">{more}</span>'
+
+
+def format_authors(authors: Optional[str], context: Dict[str, Any]) -> str:
+    """Render a BibTeX author list the way the bib layout does."""
+    names = [name.strip() for name in (authors or "").split(" and ") if name.strip()]
+    limit = context["max_author_limit"] or len(names)
+    shown = [format_author(name, context) for name in names[:limit]]
+    hidden = names[limit:]
+    if hidden:
+        return ", ".join(shown) + ", and " + format_more_authors(hidden)
+    if len(shown) > 2:
+        return ", ".join(shown[:-1]) + ", and " + shown[-1]
+    return " and ".join(shown)
+
+
+def render_badges(fields: Dict[str, Optional[str]]) -> str:
+    """Render the badge block; citation counts are looked up at build time."""
+    doi = fields.get("doi")
+    scholar_id = fields.get("google_scholar_id")
+    badges: List[str] = []
+    if doi and fields.get("altmetric"):
+        badges.append(
+            "{% if site.enable_publication_badges.altmetric %}"
+            f'<span class="altmetric-embed" data-badge-type="2" data-badge-popover="right" data-doi="{text(doi)}"></span>'
+            "{% endif %}"
+        )
+    if doi and fields.get("dimensions"):
+        badges.append(
+            "{% if site.enable_publication_badges.dimensions %}"
+            f'<span class="__dimensions_badge_embed__" data-doi="{text(doi)}" data-style="small_rectangle" '
+            'data-legend="hover-right" style="margin-bottom: 3px;"></span>'
+            "{% endif %}"
+        )
+    openalex_key = liquid_string(doi or fields.get("url"))
+    if openalex_key:
+        badges.append(
+            f"{{% assign openalex_paper = site.data.openalex_citations.papers[{openalex_key}] %}}"
+            "{% if site.enable_publication_badges.openalex and openalex_paper %}"
+            "{% assign openalex_work_id = openalex_paper.id | split: '/' | last %}"
+            '<a href="https://openalex.org/works?filter=cites:{{ openalex_work_id }}" aria-label="OpenAlex citations link" role="button">'
+            '<img src="https://img.shields.io/badge/openalex-{{ openalex_paper.citations }}-D95B43?labelColor=beige" '
+            'alt="{{ openalex_paper.citations }} OpenAlex citations"></a>'
+            "{% endif %}"
+        )
+    scholar_key = liquid_string(scholar_id)
+    if scholar_key:
+        badges.append(
+            "{% if site.enable_publication_badges.google_scholar %}"
+            f"{{% assign citation_count = site.data.citations.papers[{scholar_key}].citations | default: 0 %}}"
+            '<a href="https://scholar.google.com/citations?view_op=view_citation&hl=en&user={{ site.data.socials.scholar_userid }}'
+            f'&citation_for_view={text(scholar_id)}" aria-label="Google Scholar link" role="button">'
+            '<img src="https://img.shields.io/badge/scholar-{{ citation_count }}-4285F4?logo=googlescholar&labelColor=beige" '
+            'alt="{{ citation_count }} Google Scholar citations"></a>'
+            "{% endif %}"
+        )
+    if not badges:
+        return ""
+    lines = ["    {% if site.enable_publication_badges %}", '    <div class="badges">']
+    lines.extend(f"      {badge}" for badge in badges)
+    lines.extend(["    </div>", "    {% endif %}"])
+    return "\n".join(lines) + "\n"
+
+
+def render_fragment(key: str, fields: Dict[str, Optional[str]], context: Dict[str, Any]) -> str:
+    """Render the display fragment of one BibTeX entry."""
+    journal = fields.get("journal")
+    year = fields.get("year")
+    periodical = ", ".join(part for part in (f"<em>{text(journal)}</em>" if journal else "", text(year)) if part)
+
+    links = []
+    if fields.get("doi"):
+        links.append(
+            f'<a href="https://doi.org/{text(fields["doi"])}" class="btn btn-sm z-depth-0" role="button">DOI</a>'
+        )
+
+    column = "col-sm-8" if context["thumbnails"] else "col-sm-10"
+    lines = ['<div class="row">']
+    if context["thumbnails"]:
+        lines.append('  <div class="col col-sm-2 abbr"></div>')
+    lines.extend(
+        [
+            f'  <div id="{text(key)}" class="{column}">',
+            f'    <div class="title">{text(fields.get("title"))}</div>',
+            f'    <div class="author">{format_authors(fields.get("author"), context)}</div>',
+            f'    <div class="periodical">{periodical}</div>',
+            f'    <div class="links">{"".join(links)}</div>',
+        ]
+    )
+    return "\n".join(lines) + "\n" + render_badges(fields) + "  </div>\n</div>\n"
+
+
+class FragmentCache:
+    """Render changed publication page entries and index all of them."""
+
+    def __init__(
+        self,
+        directory: pathlib.Path = FRAGMENTS_DIR,
+        index_file: pathlib.Path = FRAGMENTS_INDEX_FILE,
+        context: Optional[Dict[str, Any]] = None,
+    ) -> None:
+        self.directory = directory
+        self.index_file = index_file
+        self.context = context if context is not None else load_render_context()
+        self.index: List[Dict[str, Any]] = []
+        self.rendered = 0
+
+    def entry_hash(self, key: str, fields: Dict[str, Optional[str]]) -> str:
+        """Hash everything that the rendered fragment depends on."""
+        payload = {
+            "version": FRAGMENT_FORMAT_VERSION,
+            "key": key,
+            "fields": fields,
+            "context": self.context,
+        }
+        encoded = json.dumps(payload, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        return hashlib.sha256(encoded).hexdigest()[:20]
+
+    def add(self, key: str, fields: Dict[str, Optional[str]]) -> None:
+        """Render the entry unless a fragment with the same hash already exists."""
+        fragment = f"{self.entry_hash(key, fields)}.html"
+        path = self.directory / fragment
+        if not path.exists():
+            self.directory.mkdir(exist_ok=True, parents=True)
+            path.write_text(render_fragment(key, fields, self.context), encoding="utf-8")
+            self.rendered += 1
+        self.index.append({"key": key, "year": fields.get("year") or "", "fragment": fragment})
+
+    def finish(self) -> None:
+        """Write the fragment index and remove fragments no entry refers to anymore."""
+        referenced = {entry["fragment"] for entry in self.index}
+        removed = 0
+        for path in self.directory.glob("*.html") if self.directory.exists() else ():
+            if path.name not in referenced:
+                path.unlink()
+                removed += 1
+
+        with self.index_file.open("w", encoding="utf-8") as file:
+            file.write("# This file is automatically generated. Do not edit manually.\n")
+            yaml.dump(self.index, file, allow_unicode=True, sort_keys=False, indent=2)
+        print(
+            f"Publication fragments: {self.rendered} rendered, "
+            f"{len(self.index) - self.rendered} reused, {removed} removed."
+        )
@@ -0,0 +1,72 @@
+"""
+Text normalization helpers shared by the publication scripts.
+
+These helpers only depend on the standard library so that lightweight tools
+(such as the publication store query CLI) can use them without importing
+the network and abbreviation dependencies of the OpenAlex generator.
+"""
+import html
+import re
+import unicodedata
+from typing import Optional
+
+ARXIV_ID_REGEX = re.compile(
+    r"(?:arxiv\.org/(?:abs|pdf)/|10\.48550/arxiv\.|arxiv:)([a-z\-]+/\d{7}|\d{4}\.\d{4,5})",
+    re.IGNORECASE,
+)
+
+
+def normalize_whitespace(value: str) -> str:
+    """Collapse repeated whitespace and strip surrounding spaces."""
+    return re.sub(r"\s+", " ", value).strip()
+
+
+def strip_tags(value: str) -> str:
+    """Remove simple HTML/MathML tags from a string."""
+    return re.sub(r"<[^>]+>", "", value)
+
+
+def format_bibtex_value(value: Optional[str]) -> Optional[str]:
+    """Normalize and sanitize a BibTeX field value."""
+    if not value:
+        return None
+    cleaned = strip_tags(value)
+    cleaned = html.unescape(cleaned)
+    return normalize_whitespace(cleaned)
+
+
+def normalize_title(title: Optional[str]) -> Optional[str]:
+    """Normalize title text for resilient publication/preprint comparisons."""
+    if not title:
+        return None
+    cleaned = format_bibtex_value(title)
+    if not cleaned:
+        return None
+    normalized = unicodedata.normalize("NFKD", cleaned)
+    normalized = normalized.replace("−", "-").replace("–", "-").replace("—", "-")
+    normalized = normalized.replace("’", "'").replace("‘", "'")
+    normalized = normalized.lower()
+    normalized = re.sub(r"[^a-z0-9]+", " ", normalized)
+    return normalize_whitespace(normalized)
+
+
+def normalize_doi(doi: Optional[str]) -> Optional[str]:
+    """Return a canonical DOI string without protocol prefixes."""
+    if not doi:
+        return None
+    normalized = doi.strip().lower()
+    for prefix in ("https://doi.org/", "http://doi.org/", "doi:"):
+        if normalized.startswith(prefix):
+            normalized = normalized[len(prefix) :]
+    return normalized
+
+
+def extract_arxiv_id(*values: Optional[str]) -> Optional[str]:
+    """Return the version-less arXiv identifier found in any of the given URLs/DOIs."""
+    for value in values:
+        if not value:
+            continue
+        match = ARXIV_ID_REGEX.search(value)
+        if match:
+            return match.group(1).lower()
+    return None
@@ -0,0 +1,122 @@
+"""
+Compact publication record shared by the merge, marking and writer stages.
+
+Records use ``__slots__`` instead of a per-record ``__dict__``, intern the
+highly repetitive venue and kind strings, and compute their normalized
+lookup keys (DOI, arXiv ID and title) at most once. They are converted to
+plain dictionaries only at the YAML/JSON/BibTeX output boundaries.
+"""
+import sys
+from typing import Any, Dict, Optional
+
+from publication_keys import extract_arxiv_id, normalize_doi, normalize_title
+
+RECORD_FIELDS = (
+    "title",
+    "author",
+    "year",
+    "date",
+    "journal",
+    "doi",
+    "href",
+    "pdf",
+    "path",
+    "kind",
+)
+
+_UNSET = object()
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if type(value) is str else value
+
+
+class PublicationRecord:
+    """A single publication; `title`, `doi`, `href` and `pdf` are treated as immutable."""
+
+    __slots__ = RECORD_FIELDS + (
+        "google_scholar_id",
+        "publication_page",
+        "unpublished_preprint",
+        "_doi_norm",
+        "_arxiv_id",
+        "_title_norm",
+    )
+
+    def __init__(
+        self,
+        title: Optional[str] = None,
+        author: Optional[str] = None,
+        year: Optional[int] = None,
+        date: Optional[str] = None,
+        journal: Optional[str] = None,
+        doi: Optional[str] = None,
+        href: Optional[str] = None,
+        pdf: Optional[str] = None,
+        path: Optional[str] = None,
+        kind: Optional[str] = None,
+        google_scholar_id: Optional[str] = None,
+        publication_page: bool = False,
+        unpublished_preprint: bool = False,
+    ) -> None:
+        self.title = title
+        self.author = author
+        self.year = year
+        self.date = date
+        self.journal = _intern(journal)
+        self.doi = doi
+        self.href = href
+        self.pdf = pdf
+        self.path = path
+        self.kind = _intern(kind)
+        self.google_scholar_id = google_scholar_id
+        self.publication_page = publication_page
+        self.unpublished_preprint = unpublished_preprint
+        self._doi_norm = _UNSET
+        self._arxiv_id = _UNSET
+        self._title_norm = _UNSET
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "PublicationRecord":
+        """Build a record from a dictionary with the output field names."""
+        return cls(
+            *(data.get(field) for field in RECORD_FIELDS),
+            google_scholar_id=data.get("google_scholar_id"),
+            publication_page=bool(data.get("publication_page")),
+            unpublished_preprint=bool(data.get("unpublished_preprint")),
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the dictionary written to the YAML outputs (optional keys only when set)."""
+        data = {field: getattr(self, field) for field in RECORD_FIELDS}
+        if self.google_scholar_id:
+            data["google_scholar_id"] = self.google_scholar_id
+        if self.unpublished_preprint:
+            data["unpublished_preprint"] = True
+        if self.publication_page:
+            data["publication_page"] = True
+        return data
+
+    @property
+    def doi_norm(self) -> Optional[str]:
+        """Normalized DOI, or None."""
+        if self._doi_norm is _UNSET:
+            self._doi_norm = normalize_doi(self.doi) or None
+        return self._doi_norm
+
+    @property
+    def arxiv_id(self) -> Optional[str]:
+        """Version-less arXiv identifier from the DOI or links, or None."""
+        if self._arxiv_id is _UNSET:
+            self._arxiv_id = extract_arxiv_id(self.doi, self.href, self.pdf)
+        return self._arxiv_id
+
+    @property
+    def title_norm(self) -> Optional[str]:
+        """Normalized title, or None."""
+        if self._title_norm is _UNSET:
+            self._title_norm = normalize_title(self.title) or None
+        return self._title_norm
+
+    def __repr__(self) -> str:
+        return f"PublicationRecord(title={self.title!r}, year={self.year!r}, kind={self.kind!r})"
@@ -0,0 +1,401 @@
+#!/usr/bin/env python3
+"""
+SQLite-backed store of canonical publications and raw source records.
+
+The OpenAlex generator upserts every fetched work into this store and then
+runs deduplication, Google Scholar ID attachment and publication page
+marking as indexed queries instead of rescanning in-memory lists. The
+writers stream their output straight from the store.
+
+Run this module directly to query the store, e.g.:
+
+    python _scripts/publication_store.py --doi 10.1103/PhysRevB.100.1
+    python _scripts/publication_store.py --title "Some paper title" --year 2024
+"""
+import argparse
+import json
+import os
+import pathlib
+import sqlite3
+import sys
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from publication_keys import extract_arxiv_id, normalize_doi, normalize_title
+from publication_record import RECORD_FIELDS, PublicationRecord
+
+ROOT_DIR = pathlib.Path(__file__).resolve().parents[1]
+STORE_FILE = pathlib.Path(
+    os.getenv("PUBLICATIONS_DB") or ROOT_DIR / ".cache" / "publications.sqlite3"
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS source_records (
+    source TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    payload TEXT NOT NULL,
+    fetched_at TEXT NOT NULL,
+    PRIMARY KEY (source, source_id)
+);
+
+CREATE TABLE IF NOT EXISTS publications (
+    id INTEGER PRIMARY KEY,
+    source TEXT NOT NULL,
+    source_id TEXT,
+    title TEXT,
+    author TEXT,
+    year INTEGER,
+    date TEXT,
+    journal TEXT,
+    doi TEXT,
+    href TEXT,
+    pdf TEXT,
+    path TEXT,
+    kind TEXT,
+    google_scholar_id TEXT,
+    publication_page INTEGER NOT NULL DEFAULT 0,
+    unpublished_preprint INTEGER NOT NULL DEFAULT 0,
+    doi_norm TEXT,
+    arxiv_id TEXT,
+    title_norm TEXT
+);
+
+CREATE TABLE IF NOT EXISTS store_state (
+    name TEXT PRIMARY KEY,
+    value INTEGER NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS publications_doi_norm ON publications (doi_norm);
+CREATE INDEX IF NOT EXISTS publications_arxiv_id ON publications (arxiv_id);
+CREATE INDEX IF NOT EXISTS publications_title_norm ON publications (title_norm);
+CREATE INDEX IF NOT EXISTS publications_year ON publications (year);
+CREATE INDEX IF NOT EXISTS publications_kind ON publications (kind);
+"""
+
+SORT_ORDER = "COALESCE(year, 0) DESC, COALESCE(date, '') DESC, id ASC"
+
+
+class PublicationStore:
+    """Canonical publication records and raw source records in one SQLite file."""
+
+    def __init__(self, path: pathlib.Path = STORE_FILE) -> None:
+        self.path = path
+        if str(path) != ":memory:":
+            pathlib.Path(path).parent.mkdir(exist_ok=True, parents=True)
+        self.connection = sqlite3.connect(str(path))
+        self.connection.row_factory = sqlite3.Row
+        self.connection.executescript(SCHEMA)
+
+    def __enter__(self) -> "PublicationStore":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Commit pending changes and close the database."""
+        self.connection.commit()
+        self.connection.close()
+
+    def commit(self) -> None:
+        """Commit pending changes."""
+        self.connection.commit()
+
+    # --- Source records ---
+
+    def replace_source_records(
+        self, source: str, items: Iterable[Tuple[str, Dict[str, Any]]]
+    ) -> int:
+        """Replace all raw records of a source with freshly fetched ones."""
+        fetched_at = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        with self.connection:
+            self.connection.execute("DELETE FROM source_records WHERE source = ?", (source,))
+            cursor = self.connection.executemany(
+                "INSERT OR REPLACE INTO source_records (source, source_id, payload, fetched_at) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    (source, source_id, json.dumps(payload, ensure_ascii=False), fetched_at)
+                    for source_id, payload in items
+                ),
+            )
+            self.connection.execute(
+                "INSERT INTO store_state (name, value) VALUES ('sources_generation', 1) "
+                "ON CONFLICT (name) DO UPDATE SET value = value + 1"
+            )
+        return cursor.rowcount
+
+    def iter_source_records(self, source: str) -> Iterator[Dict[str, Any]]:
+        """Yield the raw payloads of a source in insertion order."""
+        rows = self.connection.execute(
+            "SELECT payload FROM source_records WHERE source = ? ORDER BY rowid", (source,)
+        )
+        for row in rows:
+            yield json.loads(row["payload"])
+
+    def source_counts(self) -> Dict[str, int]:
+        """Return the number of raw records per source."""
+        rows = self.connection.execute(
+            "SELECT source, COUNT(*) AS count FROM source_records GROUP BY source ORDER BY source"
+        )
+        return {row["source"]: row["count"] for row in rows}
+
+    def state(self, name: str) -> int:
+        """Return a store state counter, or 0 if it was never set."""
+        row = self.connection.execute(
+            "SELECT value FROM store_state WHERE name = ?", (name,)
+        ).fetchone()
+        return row["value"] if row else 0
+
+    def mark_merged(self) -> None:
+        """Record that the publications were rebuilt from the current source records."""
+        with self.connection:
+            self.connection.execute(
+                "INSERT OR REPLACE INTO store_state (name, value) VALUES ('merged_generation', ?)",
+                (self.state("sources_generation"),),
+            )
+
+    def merge_is_current(self) -> bool:
+        """Return True when no source records were replaced since the last merge."""
+        return bool(self.kind_counts()) and self.state("merged_generation") == self.state(
+            "sources_generation"
+        )
+
+    # --- Canonical publications ---
+
+    def kind_counts(self) -> Dict[str, int]:
+        """Return the number of canonical publications per kind."""
+        rows = self.connection.execute(
+            "SELECT kind, COUNT(*) AS count FROM publications GROUP BY kind ORDER BY kind"
+        )
+        return {row["kind"]: row["count"] for row in rows}
+
+    def reset_publications(self) -> None:
+        """Drop all canonical publications before a full rebuild."""
+        with self.connection:
+            self.connection.execute("DELETE FROM publications")
+
+    def insert_publication(
+        self, record: PublicationRecord, source: str, source_id: Optional[str] = None
+    ) -> int:
+        """Insert a canonical publication and return its row ID."""
+        cursor = self.connection.execute(
+            f"INSERT INTO publications (source, source_id, {', '.join(RECORD_FIELDS)}, "
+            "google_scholar_id, doi_norm, arxiv_id, title_norm) "
+            f"VALUES ({', '.join('?' * (len(RECORD_FIELDS) + 6))})",
+            (
+                source,
+                source_id,
+                *(getattr(record, field) for field in RECORD_FIELDS),
+                record.google_scholar_id,
+                record.doi_norm,
+                record.arxiv_id,
+                record.title_norm,
+            ),
+        )
+        return cursor.lastrowid
+
+    def find_duplicate(self, record: PublicationRecord) -> Optional[int]:
+        """Return the ID of a stored publication sharing the DOI, arXiv ID or title."""
+        for column, value in (
+            ("doi_norm", record.doi_norm),
+            ("arxiv_id", record.arxiv_id),
+            ("title_norm", record.title_norm),
+        ):
+            if not value:
+                continue
+            row = self.connection.execute(
+                f"SELECT id FROM publications WHERE {column} = ? LIMIT 1", (value,)
+            ).fetchone()
+            if row:
+                return row["id"]
+        return None
+
+    def upsert_publication(
+        self, record: PublicationRecord, source: str, source_id: Optional[str] = None
+    ) -> Tuple[int, bool]:
+        """Insert a publication unless a duplicate exists; return (ID, inserted)."""
+        duplicate_id = self.find_duplicate(record)
+        if duplicate_id is not None:
+            return duplicate_id, False
+        return self.insert_publication(record, source, source_id), True
+
+    def find_by_title(self, title_norm: str) -> List[sqlite3.Row]:
+        """Return publications with the given normalized title."""
+        return self.connection.execute(
+            "SELECT * FROM publications WHERE title_norm = ? ORDER BY id", (title_norm,)
+        ).fetchall()
+
+    def set_google_scholar_id(self, publication_id: int, scholar_id: str) -> None:
+        """Attach a Google Scholar publication ID to a publication."""
+        self.connection.execute(
+            "UPDATE publications SET google_scholar_id = ? WHERE id = ?",
+            (scholar_id, publication_id),
+        )
+
+    def clear_publication_page_flags(self) -> None:
+        """Reset the publication page and unpublished preprint flags."""
+        self.connection.execute(
+            "UPDATE publications SET publication_page = 0, unpublished_preprint = 0"
+        )
+
+    def mark_kind_on_publication_page(self, kind: str) -> None:
+        """Show every publication of the given kind on the publication page."""
+        self.connection.execute(
+            "UPDATE publications SET publication_page = 1 WHERE kind = ?", (kind,)
+        )
+
+    def mark_unpublished_preprint(self, publication_id: int) -> None:
+        """Flag a preprint as unpublished and show it on the publication page."""
+        self.connection.execute(
+            "UPDATE publications SET publication_page = 1, unpublished_preprint = 1 WHERE id = ?",
+            (publication_id,),
+        )
+
+    def has_kind_match(self, kind: str, doi_norm: Optional[str], title_norm: Optional[str]) -> bool:
+        """Return True when a publication of the given kind shares the DOI or title."""
+        return self._exists(
+            "kind = ?", (kind,), ("doi_norm", doi_norm), ("title_norm", title_norm)
+        )
+
+    def has_unpublished_match(
+        self, doi_norm: Optional[str], title_norm: Optional[str], href: Optional[str]
+    ) -> bool:
+        """Return True when an already flagged unpublished preprint shares a key."""
+        if self._exists(
+            "unpublished_preprint = 1", (), ("doi_norm", doi_norm), ("title_norm", title_norm)
+        ):
+            return True
+        if doi_norm or title_norm or not href:
+            return False
+        return self._exists(
+            "unpublished_preprint = 1 AND doi_norm IS NULL AND title_norm IS NULL",
+            (),
+            ("href", href),
+        )
+
+    def _exists(
+        self, condition: str, params: Sequence[Any], *keys: Tuple[str, Optional[str]]
+    ) -> bool:
+        for column, value in keys:
+            if not value:
+                continue
+            row = self.connection.execute(
+                f"SELECT 1 FROM publications WHERE {column} = ? AND {condition} LIMIT 1",
+                (value, *params),
+            ).fetchone()
+            if row:
+                return True
+        return False
+
+    def publication_ids(self, kind: Optional[str] = None) -> List[int]:
+        """Return publication IDs in insertion order, optionally filtered by kind."""
+        if kind is None:
+            rows = self.connection.execute("SELECT id FROM publications ORDER BY id")
+        else:
+            rows = self.connection.execute(
+                "SELECT id FROM publications WHERE kind = ? ORDER BY id", (kind,)
+            )
+        return [row["id"] for row in rows]
+
+    def get(self, publication_id: int) -> Optional[PublicationRecord]:
+        """Return a single publication."""
+        row = self.connection.execute(
+            "SELECT * FROM publications WHERE id = ?", (publication_id,)
+        ).fetchone()
+        return row_to_record(row) if row else None
+
+    def iter_records(
+        self,
+        kinds: Optional[Sequence[str]] = None,
+        exclude_kinds: Optional[Sequence[str]] = None,
+        unpublished_only: bool = False,
+    ) -> Iterator[PublicationRecord]:
+        """Yield publication records, newest first."""
+        conditions, params = [], []
+        if kinds:
+            conditions.append(f"kind IN ({', '.join('?' * len(kinds))})")
+            params.extend(kinds)
+        if exclude_kinds:
+            conditions.append(f"(kind IS NULL OR kind NOT IN ({', '.join('?' * len(exclude_kinds))}))")
+            params.extend(exclude_kinds)
+        if unpublished_only:
+            conditions.append("unpublished_preprint = 1")
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            f"SELECT * FROM publications {where} ORDER BY {SORT_ORDER}", params
+        )
+        for row in rows:
+            yield row_to_record(row)
+
+    def query(
+        self,
+        doi: Optional[str] = None,
+        arxiv_id: Optional[str] = None,
+        title: Optional[str] = None,
+        year: Optional[int] = None,
+        kind: Optional[str] = None,
+    ) -> List[PublicationRecord]:
+        """Look up publications by any combination of indexed keys."""
+        conditions, params = [], []
+        if doi:
+            conditions.append("doi_norm = ?")
+            params.append(normalize_doi(doi))
+        if arxiv_id:
+            conditions.append("arxiv_id = ?")
+            params.append(extract_arxiv_id(arxiv_id) or arxiv_id.lower())
+        if title:
+            conditions.append("title_norm = ?")
+            params.append(normalize_title(title))
+        if year:
+            conditions.append("year = ?")
+            params.append(year)
+        if kind:
+            conditions.append("kind = ?")
+            params.append(kind)
+        where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+        rows = self.connection.execute(
+            f"SELECT * FROM publications {where} ORDER BY {SORT_ORDER}", params
+        )
+        return [row_to_record(row) for row in rows]
+
+
+def row_to_record(row: sqlite3.Row) -> PublicationRecord:
+    """Convert a publication row into a record, reusing the stored lookup keys."""
+    record = PublicationRecord(
+        *(row[field] for field in RECORD_FIELDS),
+        google_scholar_id=row["google_scholar_id"],
+        publication_page=bool(row["publication_page"]),
+        unpublished_preprint=bool(row["unpublished_preprint"]),
+    )
+    record._doi_norm = row["doi_norm"]
+    record._arxiv_id = row["arxiv_id"]
+    record._title_norm = row["title_norm"]
+    return record
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Query the publication store from the command line."""
+    parser = argparse.ArgumentParser(description="Query the local publication store.")
+    parser.add_argument("--db", type=pathlib.Path, default=STORE_FILE, help="SQLite store path")
+    parser.add_argument("--doi", help="match a DOI (any prefix, case-insensitive)")
+    parser.add_argument("--arxiv", help="match an arXiv ID or arXiv URL")
+    parser.add_argument("--title", help="match a title after normalization")
+    parser.add_argument("--year", type=int, help="match a publication year")
+    parser.add_argument("--kind", help="match a publication kind (article, preprint, ...)")
+    args = parser.parse_args(argv)
+
+    if not args.db.exists():
+        print(f"Publication store {args.db} does not exist yet.", file=sys.stderr)
+        sys.exit(1)
+
+    with PublicationStore(args.db) as store:
+        records = store.query(
+            doi=args.doi, arxiv_id=args.arxiv, title=args.title, year=args.year, kind=args.kind
+        )
+    for record in records:
+        print(json.dumps(record.to_dict(), ensure_ascii=False))
+    print(f"{len(records)} matching publications.", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
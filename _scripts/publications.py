@@ -0,0 +1,232 @@
+#!/usr/bin/env python3
+"""
+Command-line entry point for the publication pipeline.
+
+Each subcommand imports only the modules it needs, and the stages share
+their intermediate results through the local publication store, so they
+can be run separately:
+
+    python _scripts/publications.py fetch       # OpenAlex + arXiv -> store
+    python _scripts/publications.py merge       # dedupe, Scholar IDs, page flags
+    python _scripts/publications.py write       # YAML, JSON, BibTeX outputs
+    python _scripts/publications.py citations   # current OpenAlex (and --scholar) citation counts
+    python _scripts/publications.py check       # configuration and store status
+    python _scripts/publications.py bench       # PublicationRecord memory benchmark
+    python _scripts/publications.py daemon      # keep polling and regenerate on change
+"""
+import argparse
+import os
+import pathlib
+import sys
+from typing import Optional, Sequence
+
+SCRIPTS_DIR = pathlib.Path(__file__).resolve().parent
+ROOT_DIR = SCRIPTS_DIR.parent
+
+
+def env_truthy(name: str) -> bool:
+    """Return True when the environment variable is set to a truthy value."""
+    return os.getenv(name, "").strip().lower() in {"1", "true", "yes", "y", "on"}
+
+
+def open_store(args: argparse.Namespace, require_sources: bool = False):
+    """Open the publication store, optionally requiring fetched source records."""
+    from publication_store import PublicationStore
+
+    if require_sources and not args.db.exists():
+        print(f"Publication store {args.db} does not exist. Run 'fetch' first.", file=sys.stderr)
+        sys.exit(1)
+    store = PublicationStore(args.db)
+    if require_sources and not store.source_counts():
+        store.close()
+        print(f"Publication store {args.db} has no source records. Run 'fetch' first.", file=sys.stderr)
+        sys.exit(1)
+    return store
+
+
+def run_fetch(args: argparse.Namespace) -> None:
+    """Fetch OpenAlex works and arXiv preprints into the store."""
+    if env_truthy("SKIP_OPENALEX"):
+        print("SKIP_OPENALEX is set; skipping OpenAlex/arXiv fetch.")
+        return
+
+    import openalex_to_yaml
+
+    openalex_to_yaml.validate_orcid()
+    with open_store(args) as store:
+        openalex_to_yaml.fetch_sources(store)
+        print(f"Stored source records: {store.source_counts()}")
+
+
+def run_merge(args: argparse.Namespace) -> None:
+    """Rebuild canonical publications from the stored source records."""
+    import openalex_to_yaml
+
+    with open_store(args, require_sources=True) as store:
+        openalex_to_yaml.merge_stored_sources(store)
+        print(f"Canonical publications: {store.kind_counts()}")
+
+
+def run_write(args: argparse.Namespace) -> None:
+    """Write the YAML, JSON, BibTeX and citation outputs from the store."""
+    import openalex_to_yaml
+
+    with open_store(args, require_sources=True) as store:
+        if not store.merge_is_current():
+            print("Source records changed since the last merge; merging before writing.")
+            openalex_to_yaml.merge_stored_sources(store)
+        openalex_to_yaml.write_outputs(store)
+
+
+def prepare_scholar() -> None:
+    """Make bin/update_scholar_citations.py importable and usable."""
+    sys.path.insert(0, str(ROOT_DIR / "bin"))
+    # The Scholar script resolves its data files relative to the site root.
+    os.chdir(ROOT_DIR)
+
+
+def run_citations(args: argparse.Namespace) -> None:
+    """Fetch current citation counts from OpenAlex and, optionally, Google Scholar."""
+    import openalex_to_yaml
+
+    skip_openalex = env_truthy("SKIP_OPENALEX")
+    if not skip_openalex:
+        # Fail on a bad ORCID before the slow Google Scholar scrape.
+        openalex_to_yaml.validate_orcid()
+
+    if args.scholar:
+        prepare_scholar()
+        import update_scholar_citations
+
+        update_scholar_citations.get_scholar_citations()
+
+    if skip_openalex:
+        print("SKIP_OPENALEX is set; skipping OpenAlex citation fetch.")
+        return
+    works = openalex_to_yaml.fetch_publications(
+        openalex_to_yaml.ORCID_ID, select=openalex_to_yaml.OPENALEX_CITATION_FIELDS
+    )
+    if not works:
+        print("OpenAlex returned no works; keeping the existing citation counts.")
+        return
+    openalex_to_yaml.write_openalex_citations_file(
+        openalex_to_yaml.collect_openalex_citations(works)
+    )
+
+
+def run_check(args: argparse.Namespace) -> None:
+    """Report configuration problems and the state of the store and outputs."""
+    import openalex_to_yaml
+
+    problems = []
+    if not openalex_to_yaml.ORCID_REGEX.match(openalex_to_yaml.ORCID_ID or ""):
+        problems.append(f"invalid ORCID_ID '{openalex_to_yaml.ORCID_ID}'")
+    try:
+        rules = openalex_to_yaml.get_venue_rules()
+        print(f"Venue rules: {len(rules.aliases)} aliases, {len(rules.rules)} reclassification rules")
+    except (OSError, ValueError) as exc:
+        problems.append(f"venue rules could not be loaded: {exc}")
+
+    if args.db.exists():
+        with open_store(args) as store:
+            print(f"Store {args.db}: sources {store.source_counts()}, publications {store.kind_counts()}")
+    else:
+        print(f"Store {args.db} does not exist yet.")
+
+    for path in (
+        openalex_to_yaml.ARTICLES_FILE,
+        openalex_to_yaml.PREPRINTS_FILE,
+        openalex_to_yaml.OTHERS_FILE,
+        openalex_to_yaml.PREPRINTS_UNPUBLISHED_FILE,
+        openalex_to_yaml.ARTICLES_JSON_FILE,
+        openalex_to_yaml.PREPRINTS_JSON_FILE,
+        openalex_to_yaml.BIBLIOGRAPHY_FILE,
+    ):
+        if not path.exists():
+            problems.append(f"missing output {path.relative_to(ROOT_DIR)}")
+
+    for problem in problems:
+        print(f"Problem: {problem}", file=sys.stderr)
+    if problems:
+        sys.exit(1)
+    print("No problems found.")
+
+
+def run_bench(args: argparse.Namespace) -> None:
+    """Run the PublicationRecord memory benchmark."""
+    import bench_publication_records
+
+    bench_publication_records.run(args.count, args.passes)
+
+
+def run_daemon(args: argparse.Namespace) -> None:
+    """Keep polling the sources and regenerate the outputs when they change."""
+    import openalex_to_yaml
+    from publication_daemon import PublicationDaemon
+
+    openalex_to_yaml.validate_orcid()
+    if args.scholar:
+        prepare_scholar()
+    with open_store(args) as store:
+        intervals = {
+            name: value
+            for name, value in (
+                ("min_interval", args.min_interval),
+                ("max_interval", args.max_interval),
+            )
+            if value is not None
+        }
+        daemon = PublicationDaemon(store, scholar=args.scholar, **intervals)
+        daemon.run(args.cycles)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """Create the argument parser with all subcommands."""
+    from publication_store import STORE_FILE
+
+    parser = argparse.ArgumentParser(description="Publication pipeline for the Jekyll site.")
+    parser.add_argument("--db", type=pathlib.Path, default=STORE_FILE, help="SQLite store path")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    subparsers.add_parser("fetch", help=run_fetch.__doc__).set_defaults(handler=run_fetch)
+    subparsers.add_parser("merge", help=run_merge.__doc__).set_defaults(handler=run_merge)
+    subparsers.add_parser("write", help=run_write.__doc__).set_defaults(handler=run_write)
+
+    citations = subparsers.add_parser("citations", help=run_citations.__doc__)
+    citations.add_argument(
+        "--scholar", action="store_true", help="also update the Google Scholar citation cache"
+    )
+    citations.set_defaults(handler=run_citations)
+
+    subparsers.add_parser("check", help=run_check.__doc__).set_defaults(handler=run_check)
+
+    bench = subparsers.add_parser("bench", help=run_bench.__doc__)
+    bench.add_argument("--count", type=int, default=100_000, help="records per batch")
+    bench.add_argument("--passes", type=int, default=3, help="key-access passes")
+    bench.set_defaults(handler=run_bench)
+
+    daemon = subparsers.add_parser("daemon", help=run_daemon.__doc__)
+    daemon.add_argument(
+        "--min-interval", type=float, help="shortest poll interval in seconds (default 300)"
+    )
+    daemon.add_argument(
+        "--max-interval", type=float, help="longest poll interval in seconds (default 21600)"
+    )
+    daemon.add_argument("--cycles", type=int, help="stop after this many poll cycles")
+    daemon.add_argument(
+        "--scholar", action="store_true", help="also poll Google Scholar (at most every 6 hours)"
+    )
+    daemon.set_defaults(handler=run_daemon)
+    return parser
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    """Parse arguments and run the selected subcommand."""
+    args = build_parser().parse_args(argv)
+    # Resolve against the caller's directory before prepare_scholar changes it.
+    args.db = args.db.resolve()
+    args.handler(args)
+
+
+if __name__ == "__main__":
+    main()
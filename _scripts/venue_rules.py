@@ -0,0 +1,159 @@
+"""
+Declarative venue normalization and publication kind rules.
+
+The rules live in venue_rules.yml and are compiled once into a lookup table
+for exact names plus a single combined regular expression for aliases and
+for name prefixes, so each record is classified in one pass regardless of
+how many venues are configured. Every rule keeps a hit counter.
+"""
+import pathlib
+import re
+from collections import Counter
+from typing import Any, Callable, Dict, List, Optional, Pattern, Sequence
+
+import yaml
+
+RULES_FILE = pathlib.Path(__file__).resolve().parent / "venue_rules.yml"
+
+
+class ReclassifyRule:
+    """A single kind reclassification rule."""
+
+    def __init__(self, spec: Dict[str, Any]) -> None:
+        if not spec.get("name") or not spec.get("kind"):
+            raise ValueError(f"Reclassification rule needs a name and a kind: {spec!r}")
+        self.name: str = spec["name"]
+        self.kind: str = spec["kind"]
+        self.from_kinds = frozenset(spec.get("from_kinds") or ())
+        self.missing = bool(spec.get("missing"))
+        self.ignore_case = bool(spec.get("ignore_case"))
+        self.exact: List[str] = [self._fold(value) for value in spec.get("exact") or ()]
+        self.prefixes: List[str] = [self._fold(value) for value in spec.get("prefixes") or ()]
+
+    def _fold(self, value: str) -> str:
+        return value.lower() if self.ignore_case else value
+
+    def applies_to(self, kind: Optional[str]) -> bool:
+        """Return True when the rule may reclassify records of the given kind."""
+        return not self.from_kinds or kind in self.from_kinds
+
+    def matches(self, venue: Optional[str]) -> bool:
+        """Match the venue without the compiled tables (used on the fallback path)."""
+        if venue is None:
+            return self.missing
+        folded = self._fold(venue)
+        return folded in self.exact or any(folded.startswith(prefix) for prefix in self.prefixes)
+
+
+class VenueRules:
+    """Compiled venue aliases, abbreviation overrides and kind reclassification rules."""
+
+    def __init__(
+        self,
+        abbreviations: Dict[str, str],
+        aliases: Sequence[Dict[str, Any]],
+        reclassify: Sequence[Dict[str, Any]],
+    ) -> None:
+        self.abbreviations = dict(abbreviations)
+        self.hits: Counter = Counter()
+        self._abbreviated: Dict[str, str] = {}
+
+        self.aliases = list(aliases)
+        for alias in self.aliases:
+            if not alias.get("name") or not alias.get("pattern") or not alias.get("venue"):
+                raise ValueError(f"Venue alias needs a name, a pattern and a venue: {alias!r}")
+        self._alias_regex = self._combine(
+            f"(?P<a{index}>{alias['pattern']})" for index, alias in enumerate(self.aliases)
+        )
+
+        self.rules = [ReclassifyRule(spec) for spec in reclassify]
+        self._missing_rules = [index for index, rule in enumerate(self.rules) if rule.missing]
+        self._exact: Dict[str, List[int]] = {}
+        self._exact_folded: Dict[str, List[int]] = {}
+        prefix_groups = []
+        for index, rule in enumerate(self.rules):
+            table = self._exact_folded if rule.ignore_case else self._exact
+            for value in rule.exact:
+                table.setdefault(value, []).append(index)
+            if rule.prefixes:
+                alternatives = "|".join(re.escape(prefix) for prefix in rule.prefixes)
+                flags = "?i:" if rule.ignore_case else "?:"
+                prefix_groups.append(f"(?P<r{index}>({flags}{alternatives}))")
+        self._prefix_regex = self._combine(prefix_groups)
+
+    @staticmethod
+    def _combine(groups: Any) -> Optional[Pattern[str]]:
+        pattern = "|".join(groups)
+        return re.compile(pattern) if pattern else None
+
+    @classmethod
+    def from_file(cls, path: pathlib.Path = RULES_FILE) -> "VenueRules":
+        """Load and compile rules from a YAML file."""
+        with path.open("r", encoding="utf-8") as file:
+            data = yaml.safe_load(file) or {}
+        return cls(
+            data.get("abbreviations") or {},
+            data.get("aliases") or [],
+            data.get("reclassify") or [],
+        )
+
+    def normalize_venue(
+        self, name: Optional[str], abbreviate: Callable[[str], str]
+    ) -> Optional[str]:
+        """Abbreviate a source name and apply the first matching venue alias."""
+        if not name:
+            return name
+        venue = self._abbreviated.get(name)
+        if venue is None:
+            if name in self.abbreviations:
+                self.hits[f"abbreviation:{name}"] += 1
+                venue = self.abbreviations[name]
+            else:
+                venue = abbreviate(name)
+            self._abbreviated[name] = venue
+        elif name in self.abbreviations:
+            self.hits[f"abbreviation:{name}"] += 1
+
+        if venue and self._alias_regex is not None:
+            match = self._alias_regex.match(venue)
+            if match:
+                alias = self.aliases[int(match.lastgroup[1:])]
+                self.hits[f"alias:{alias['name']}"] += 1
+                venue = alias["venue"]
+        return venue
+
+    def reclassify(self, kind: Optional[str], venue: Optional[str]) -> Optional[str]:
+        """Return the publication kind after applying the first matching rule."""
+        if venue is None:
+            candidates = list(self._missing_rules)
+            prefix_index = None
+        else:
+            candidates = self._exact.get(venue, []) + self._exact_folded.get(venue.lower(), [])
+            prefix_index = None
+            if self._prefix_regex is not None:
+                match = self._prefix_regex.match(venue)
+                if match:
+                    prefix_index = int(match.lastgroup[1:])
+                    candidates.append(prefix_index)
+
+        for index in sorted(candidates):
+            rule = self.rules[index]
+            if rule.applies_to(kind):
+                return self._hit(rule)
+            if index == prefix_index:
+                # Later prefix rules are hidden behind this alternative; scan them directly.
+                for later in self.rules[index + 1 :]:
+                    if later.applies_to(kind) and later.matches(venue):
+                        return self._hit(later)
+                break
+        return kind
+
+    def _hit(self, rule: ReclassifyRule) -> str:
+        self.hits[f"reclassify:{rule.name}"] += 1
+        return rule.kind
+
+    def hit_summary(self) -> str:
+        """Return the rule hit counts as a single human-readable line."""
+        if not self.hits:
+            return "no venue rule hits"
+        return ", ".join(f"{name}={count}" for name, count in self.hits.most_common())
@@ -4,7 +4,6 @@ import os
 import sys
 import yaml
 from datetime import datetime
-from scholarly import scholarly
 
 
 def env_truthy(name: str) -> bool:
@@ -93,6 +92,10 @@ def get_scholar_citations() -> None:
 
     citation_data = {"metadata": {"last_updated": today}, "papers": {}}
 
+    # Imported lazily: scholarly pulls in a large dependency tree that skipped
+    # and already-up-to-date runs never need.
+    from scholarly import scholarly
+
     scholarly.set_timeout(15)
     scholarly.set_retries(3)
     try: